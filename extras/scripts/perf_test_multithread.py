@@ -1,28 +1,132 @@
 #!/usr/bin/env python3
+"""Spin up CPU-bound workers to give perf something to sample.
+
+Best run on a free-threaded interpreter (PEP 703), e.g.:
+
+    python3.13t extras/scripts/perf_test_multithread.py
+
+With the GIL disabled the workers run as real threads inside one process, so
+perf_record_all_threads.sh / perf_per_thread_flames.sh see one TID per worker.
+On a stock (GIL) interpreter the workers fall back to separate processes so
+they still occupy one core each. If numba is installed the loop is compiled
+with nogil=True, so threads are used even with the GIL enabled.
+"""
+import multiprocessing as mp
+import signal
+import sys
 import threading
 import time
 
-running = True
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to the pure-Python loop
+    np = None
 
-def worker(i):
-    # busy loop with periodic sleeps to create some activity
-    while running:
+# Busy time per iteration before the 10ms sleep; roughly what the original
+# pure-Python 10000-element loop took. Work sizes are calibrated to hit it.
+BUSY_SECONDS = 0.0005
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional as well
+    njit = None
+
+if njit is not None:
+    # Plain range rather than prange/parallel=True: each worker should stay on
+    # its own thread so per-thread profiles map one-to-one to workers.
+    # A plain sum of squares is folded into a closed form by LLVM, so the loop
+    # would never run; an FNV-style hash carried across a runtime array cannot
+    # be folded and costs time linear in reps.
+    @njit(nogil=True, cache=True)
+    def kernel(data, reps):
+        h = np.uint64(14695981039346656037)
+        for _ in range(reps):
+            for x in data:
+                h = (h ^ x) * np.uint64(1099511628211)
+        return h
+else:
+    kernel = None
+
+def make_busy(n):
+    """Return a callable that performs one unit of work of size n."""
+    if kernel is not None:
+        data = np.arange(1024, dtype=np.uint64)
+        reps = max(1, n // len(data))
+        return lambda: kernel(data, reps)
+    if np is not None:
+        # Allocated once so each call only pays for the C-level multiply/sum,
+        # which runs outside the GIL. Capped to a cache-sized chunk and
+        # repeated, so large n stays CPU-bound instead of memory-bound.
+        squares = np.arange(min(n, 65536), dtype=np.int64)
+        reps = max(1, n // len(squares))
+        def numpy_loop():
+            for _ in range(reps):
+                s = int((squares * squares).sum())
+            return s
+        return numpy_loop
+    def python_loop():
         s = 0
-        for j in range(10000):
+        for j in range(n):
             s += j * j
+        return s
+    return python_loop
+
+def calibrate(n=1000):
+    """Rescale n until one make_busy(n) call takes about BUSY_SECONDS."""
+    for _ in range(20):
+        busy = make_busy(n)
+        busy()  # warm-up: JIT compile, page in the array
+        dt = float('inf')
+        for _ in range(3):
+            t0 = time.perf_counter()
+            busy()
+            dt = min(dt, time.perf_counter() - t0)
+        ratio = BUSY_SECONDS / max(dt, 1e-9)
+        if 0.8 <= ratio <= 1.25:
+            break
+        n = max(1, int(n * min(ratio, 4)))  # grow at most 4x per round
+    return n
+
+def worker(i, stop_event, n):
+    # busy loop with periodic sleeps to create some activity
+    busy = make_busy(n)
+    while not stop_event.is_set():
+        busy()
         time.sleep(0.01)
 
+def process_worker(i, stop_event, n):
+    # Ctrl-C reaches the whole process group; let only the parent handle it and
+    # stop the children through stop_event.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker(i, stop_event, n)
+
+def gil_enabled():
+    # sys._is_gil_enabled() only exists on 3.13+; older builds always have the GIL.
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
 if __name__ == '__main__':
-    threads = []
+    n = calibrate()
+    if gil_enabled() and kernel is None:
+        print("warning: GIL is enabled; running workers as processes "
+              "(use a free-threaded build such as python3.13t for threads)",
+              file=sys.stderr)
+        # Writes to module globals do not propagate to child processes, so the
+        # stop flag must be a multiprocessing Event.
+        stop_event = mp.Event()
+        spawn, target = mp.Process, process_worker
+    else:
+        stop_event = threading.Event()
+        spawn, target = threading.Thread, worker
+    workers = []
     for i in range(4):
-        t = threading.Thread(target=worker, args=(i,), name=f"worker-{i}")
-        t.start()
-        threads.append(t)
+        w = spawn(target=target, args=(i, stop_event, n), name=f"worker-{i}")
+        w.start()
+        workers.append(w)
     try:
         # run for 30s unless killed
         time.sleep(30)
     except KeyboardInterrupt:
         pass
-    running = False
-    for t in threads:
-        t.join()
+    stop_event.set()
+    for w in workers:
+        w.join()
@@ -19,6 +19,7 @@ from __future__ import annotations
 import sys
 import pathlib
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 ROOT = pathlib.Path(__file__).parent
 LIBZT_DIR = ROOT / 'libzt'
@@ -31,20 +32,32 @@ ERRNO_HEADER_INCLUDE = '#include "zts_errno.hpp"'
 
 # Match variant extern declarations.
 EXTERN_PATTERN = re.compile(
-    r'^\s*extern'                  # leading extern
+    r'^[ \t]*extern'               # leading extern (indent stays on this line)
     r'(?:\s+"C")?'               # optional "C"
     r'(?:\s+\w+)*'                # optional qualifiers (const, volatile, etc.)
     r'\s+int\s+zts_errno\s*;'     # variable name
-    r'\s*(?://.*|/\*.*?\*/)?\s*$',  # optional trailing comment
+    r'[ \t]*(?://.*|/\*.*?\*/)?[ \t]*$',  # optional trailing comment, same line
     re.MULTILINE
 )
 
 # Match plain definitions (with optional initialization & qualifiers omitted by design).
 DEFINITION_PATTERN = re.compile(
-    r'^\s*(?:int)\s+zts_errno'    # base type and name
+    r'^[ \t]*(?:int)\s+zts_errno' # base type and name (indent stays on this line)
     r'(?:\s*=\s*[^;]+)?'          # optional initialization
     r'\s*;'                        # semicolon
-    r'\s*(?://.*|/\*.*?\*/)?\s*$',  # optional comment
+    r'[ \t]*(?://.*|/\*.*?\*/)?[ \t]*$',  # optional comment, same line
+    re.MULTILINE
+)
+
+# Cheap pre-check: both patterns require 'int <ws> zts_errno', which no longer
+# occurs once every declaration/definition has been replaced by the include.
+NEEDS_PATCH_PATTERN = re.compile(r'\bint\s+zts_errno\b')
+
+# Both forms in one alternation so each file is scanned once. Leading/trailing
+# whitespace in both patterns is [ \t] rather than \s so adjacent matches
+# cannot swallow the line breaks between them.
+COMBINED_PATTERN = re.compile(
+    rf'(?:{EXTERN_PATTERN.pattern})|(?:{DEFINITION_PATTERN.pattern})',
     re.MULTILINE
 )
 
@@ -54,24 +67,27 @@ def patch_replace_extern(file: pathlib.Path) -> bool:
     if not file.exists():
         return False
     original = file.read_text(encoding='utf-8')
-    # First replace any extern declarations, then plain definitions.
-    text = EXTERN_PATTERN.sub(ERRNO_HEADER_INCLUDE, original)
-    if text == original:  # Only attempt second pattern if first made no change on that line
-        text = DEFINITION_PATTERN.sub(ERRNO_HEADER_INCLUDE, text)
-    if text != original:
-        file.write_text(text, encoding='utf-8')
-        return True
-    return False
+    # Skip the multiline pass on already-patched files (the common reconfigure case).
+    if not NEEDS_PATCH_PATTERN.search(original):
+        return False
+    # Replace extern declarations and plain definitions in a single pass.
+    text, count = COMBINED_PATTERN.subn(ERRNO_HEADER_INCLUDE, original)
+    if count == 0:
+        return False
+    file.write_text(text, encoding='utf-8')
+    return True
 
 
 def main():
     if not LIBZT_DIR.exists():
         print("libzt directory not present; nothing to patch yet", file=sys.stderr)
         return 0
-    sockets_changed = patch_replace_extern(SRC_SOCKETS)
-    lwip_changed = patch_replace_extern(LWIP_SOCKETS_C)
-    header_changed = patch_replace_extern(PUBLIC_HEADER)
-    crate_header_changed = patch_replace_extern(CRATE_HEADER)
+    targets = [SRC_SOCKETS, LWIP_SOCKETS_C, PUBLIC_HEADER, CRATE_HEADER]
+    # Files are independent and the work is mostly blocking I/O, so patch them concurrently.
+    with ThreadPoolExecutor(max_workers=len(targets)) as ex:
+        sockets_changed, lwip_changed, header_changed, crate_header_changed = ex.map(
+            patch_replace_extern, targets
+        )
     if any([sockets_changed, lwip_changed, header_changed, crate_header_changed]):
         print(
             "Applied zts_errno replacement "
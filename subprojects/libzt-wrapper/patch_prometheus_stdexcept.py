@@ -3,51 +3,51 @@
 Ensure prometheus-cpp-lite headers include <stdexcept> for std::invalid_argument.
 This is idempotent and only touches the two headers if the include is missing.
 """
+import mmap
 import sys
 import pathlib
 
+INCLUDE = b'#include <stdexcept>'
+
+def has_include(path: pathlib.Path) -> bool:
+    """Search the raw bytes via mmap so the already-patched case never decodes the file."""
+    with path.open('rb') as f:
+        if path.stat().st_size == 0:  # mmap cannot map an empty file
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(INCLUDE) != -1
+
 def ensure_include(path: pathlib.Path) -> bool:
     if not path.exists():
         return False
-    text = path.read_text(encoding='utf-8')
-    if '#include <stdexcept>' in text:
+    if has_include(path):
         return False
+    text = path.read_text(encoding='utf-8')
     lines = text.splitlines()
-    out = []
-    inserted = False
+    # Single pass to pick the insertion point, in order of preference:
+    #   1. right after the first '#include <cassert>'
+    #   2. after the first block of includes
+    #   3. after '#pragma once', else at the top of the file
+    cassert_idx = None
+    block_end = None
+    block_done = False
+    pragma_idx = None
     for i, line in enumerate(lines):
-        out.append(line)
-        # Insert right after the first '#include <cassert>' if present, else after first block of includes
-        if not inserted and line.strip() == '#include <cassert>':
-            out.append('#include <stdexcept>')
-            inserted = True
-    if not inserted:
-        # fallback: insert after last leading include
-        out = []
-        inserted = False
-        inserted_line = None
-        for i, line in enumerate(lines):
-            out.append(line)
-            if not inserted and line.strip().startswith('#include '):
-                inserted_line = i
-            if inserted_line is not None and not line.strip().startswith('#include '):
-                # at first non-include after some includes
-                out.insert(len(out)-1, '#include <stdexcept>')
-                inserted = True
-                inserted_line = None
-        if not inserted:
-            # if file has no includes, put at top after pragma once if present
-            out = []
-            first = True
-            for line in lines:
-                if first and line.strip().startswith('#pragma once'):
-                    out.append(line)
-                    out.append('#include <stdexcept>')
-                    first = False
-                else:
-                    out.append(line)
-            inserted = True
-    path.write_text('\n'.join(out) + ('\n' if not out[-1].endswith('\n') else ''), encoding='utf-8')
+        stripped = line.strip()
+        if stripped == '#include <cassert>':
+            cassert_idx = i + 1
+            break
+        if stripped.startswith('#include '):
+            if not block_done:
+                block_end = i + 1
+        elif block_end is not None:
+            block_done = True
+        if pragma_idx is None and stripped.startswith('#pragma once'):
+            pragma_idx = i + 1
+    idx = next(i for i in (cassert_idx, block_end, pragma_idx, 0) if i is not None)
+    lines.insert(idx, '#include <stdexcept>')
+    lines.append('')  # trailing newline
+    path.write_text('\n'.join(lines), encoding='utf-8')
     return True
 
 
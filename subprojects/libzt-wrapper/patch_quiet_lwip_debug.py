@@ -7,18 +7,26 @@ import sys
 # in debug builds by removing -DSOCKETS_DEBUG=128 and setting LWIP_DBG_TYPES_ON=0,
 # while preserving -DLWIP_DEBUG=1 for debug asserts if desired. It's idempotent.
 
+# SOCKETS_DEBUG=128 definitions to neutralize
+_SOCK_DBG_RE = re.compile(r"^\s*set\(LWIP_FLAGS\s+\"\$\{LWIP_FLAGS\}[^\n]*-DSOCKETS_DEBUG=128\"\)\s*$",
+                          re.MULTILINE)
+# LWIP_DBG_TYPES_ON=128 in debug blocks, forced to 0
+_DBG_TYPES_RE = re.compile(r"set\(LWIP_FLAGS\s+\"\$\{LWIP_FLAGS\}\s+-DLWIP_DBG_TYPES_ON=128\"\)")
+
 def patch_file(path):
     with open(path, 'r', encoding='utf-8') as f:
         s = f.read()
 
     orig = s
-    # Neutralize SOCKETS_DEBUG=128 definitions
-    s = re.sub(r"^\s*set\(LWIP_FLAGS\s+\"\$\{LWIP_FLAGS\}[^\n]*-DSOCKETS_DEBUG=128\"\)\s*$",
-               lambda m: '# ' + m.group(0) + ' (disabled by Meson libzt_quiet_lwip_debug)\n', s, flags=re.MULTILINE)
-    # Force LWIP_DBG_TYPES_ON=0 in debug blocks by annotating and replacing
-    s = re.sub(r"set\(LWIP_FLAGS\s+\"\$\{LWIP_FLAGS\}\s+-DLWIP_DBG_TYPES_ON=128\"\)",
-               "set(LWIP_FLAGS \"${LWIP_FLAGS} -DLWIP_DBG_TYPES_ON=0\")  # overridden by Meson libzt_quiet_lwip_debug",
-               s)
+    # Already-patched files leave the SOCKETS_DEBUG line commented out, so test the
+    # live pattern rather than the flag text; skip both passes when nothing is left.
+    if _SOCK_DBG_RE.search(s) is not None or '-DLWIP_DBG_TYPES_ON=128' in s:
+        # Neutralize SOCKETS_DEBUG=128 definitions
+        s = _SOCK_DBG_RE.sub(lambda m: '# ' + m.group(0) + ' (disabled by Meson libzt_quiet_lwip_debug)\n', s)
+        # Force LWIP_DBG_TYPES_ON=0 in debug blocks by annotating and replacing
+        s = _DBG_TYPES_RE.sub(
+            "set(LWIP_FLAGS \"${LWIP_FLAGS} -DLWIP_DBG_TYPES_ON=0\")  # overridden by Meson libzt_quiet_lwip_debug",
+            s)
 
     if s != orig:
         with open(path, 'w', encoding='utf-8') as f:
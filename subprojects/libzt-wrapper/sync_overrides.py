@@ -2,7 +2,8 @@
 """Synchronize locally patched/override files into the vendored libzt tree.
 
 This script makes the Windows-specific copy logic in build-libzt.ps1 portable.
-It is idempotent: files are only copied when content differs (SHA-256 compare).
+It is idempotent: files are only copied when content differs (size check,
+then byte compare; SHA-256 compare with --verify).
 
 Run every Meson configure; cheap when nothing changed.
 
@@ -16,15 +17,18 @@ Override sources are kept alongside this script (authoritative copies):
 Usage (Meson run_command):
     run_command(py, join_paths(meson.current_source_dir(), 'sync_overrides.py'), libzt_dir)
 
+Usage (CLI):
+    sync_overrides.py [--verify] <path-to-libzt-root>
+
 Exit code 0 always (warnings don't abort the build) unless an unexpected
 exception occurs.
 """
 from __future__ import annotations
 import hashlib
 import pathlib
-import shutil
 import sys
-from typing import Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 ROOT = pathlib.Path(__file__).parent.resolve()
 
@@ -39,47 +43,90 @@ OVERRIDES: Tuple[Tuple[str, str], ...] = (
 )
 
 def sha256(path: pathlib.Path) -> str:
-    h = hashlib.sha256()
     with path.open('rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: C-level read loop
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(1024 * 64), b''):
             h.update(chunk)
     return h.hexdigest()
 
-def sync(libzt_root: pathlib.Path) -> int:
+def same_content(data: bytes, dst: pathlib.Path, src_digest: Optional[str] = None) -> bool:
+    """Compare cached source bytes against dst (SHA-256 when src_digest is given).
+
+    A missing dst compares unequal; the single stat() doubles as the existence check.
+    """
+    try:
+        if len(data) != dst.stat().st_size:
+            return False
+    except FileNotFoundError:
+        return False
+    if src_digest is not None:
+        return sha256(dst) == src_digest
+    return dst.read_bytes() == data
+
+def read_sources() -> Dict[str, bytes]:
+    """Read every override source that exists, one open() per file."""
+    srcs: Dict[str, bytes] = {}
+    for rel, _ in OVERRIDES:
+        try:
+            srcs[rel] = (ROOT / rel).read_bytes()
+        except FileNotFoundError:
+            pass
+    return srcs
+
+def sync(libzt_root: pathlib.Path, verify: bool = False) -> int:
     if not libzt_root.exists():
         print(f"[sync-overrides] libzt directory not found yet: {libzt_root}")
         return 0
 
-    changed = False
-    for src_rel, dst_rel in OVERRIDES:
-        src = ROOT / src_rel
+    # Read every override source once up front; the bytes are reused for both
+    # the comparison and the write, so sources are never opened twice.
+    srcs = read_sources()
+    src_digests: Dict[str, str] = (
+        {rel: hashlib.sha256(data).hexdigest() for rel, data in srcs.items()} if verify else {}
+    )
+
+    def sync_one(src_rel: str, dst_rel: str) -> Tuple[bool, List[str]]:
+        """Bring one destination up to date; return (copied, log lines)."""
         dst = libzt_root / dst_rel
-        if not src.exists():
-            print(f"[sync-overrides][WARN] Missing override source: {src_rel}")
-            continue
+        if src_rel not in srcs:
+            return False, [f"[sync-overrides][WARN] Missing override source: {src_rel}"]
+        log: List[str] = []
+        try:
+            if same_content(srcs[src_rel], dst, src_digests.get(src_rel)):
+                return False, log
+        except Exception as e:  # pragma: no cover - defensive
+            log.append(f"[sync-overrides][WARN] Content check failed for {dst_rel}: {e}")
         dst.parent.mkdir(parents=True, exist_ok=True)
-        need_copy = True
-        if dst.exists():
-            try:
-                if sha256(src) == sha256(dst):
-                    need_copy = False
-            except Exception as e:  # pragma: no cover - defensive
-                print(f"[sync-overrides][WARN] Hash check failed for {dst_rel}: {e}")
-        if need_copy:
-            shutil.copy2(src, dst)
-            print(f"[sync-overrides] Updated {dst_rel} <= {src_rel}")
-            changed = True
+        dst.write_bytes(srcs[src_rel])
+        log.append(f"[sync-overrides] Updated {dst_rel} <= {src_rel}")
+        return True, log
+
+    # Each override touches a distinct destination, so check/copy them concurrently.
+    # Workers never print; their log lines are emitted here in OVERRIDES order.
+    with ThreadPoolExecutor(max_workers=len(OVERRIDES)) as ex:
+        results = list(ex.map(lambda o: sync_one(*o), OVERRIDES))
+
+    changed = False
+    for copied, log in results:
+        for line in log:
+            print(line)
+        changed |= copied
     if not changed:
         print("[sync-overrides] All overrides up to date")
     return 0
 
 def main(argv: Iterable[str]) -> int:
-    if len(argv) < 2:
-        print("Usage: sync_overrides.py <path-to-libzt-root>", file=sys.stderr)
+    args = list(argv)[1:]
+    verify = "--verify" in args
+    args = [a for a in args if a != "--verify"]
+    if not args:
+        print("Usage: sync_overrides.py [--verify] <path-to-libzt-root>", file=sys.stderr)
         return 0
-    libzt_root = pathlib.Path(argv[1]).resolve()
+    libzt_root = pathlib.Path(args[0]).resolve()
     try:
-        return sync(libzt_root)
+        return sync(libzt_root, verify)
     except Exception as e:  # pragma: no cover - defensive
         print(f"[sync-overrides][ERROR] {e}", file=sys.stderr)
         return 1
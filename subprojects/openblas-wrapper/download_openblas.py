@@ -125,6 +125,16 @@ def generate_msvc_import_lib(dll_path: Path, lib_path: Path) -> bool:
 # Linux source build
 # ---------------------------------------------------------------------------
 
+def _write_stderr_tail(header: str, stderr: bytes, limit: int = 2000) -> None:
+    """Write the tail of *stderr* undecoded (diagnostics may not be UTF-8)."""
+    print(f"{header}:", file=sys.stderr, flush=True)
+    tail = stderr[-limit:]
+    sys.stderr.buffer.write(tail)
+    if not tail.endswith(b"\n"):
+        sys.stderr.buffer.write(b"\n")
+    sys.stderr.buffer.flush()
+
+
 def build_openblas_from_source(src_dir: Path, install_prefix: Path) -> None:
     """Build OpenBLAS from source and install to *install_prefix*."""
     nproc = os.cpu_count() or 2
@@ -139,11 +149,11 @@ def build_openblas_from_source(src_dir: Path, install_prefix: Path) -> None:
     result = subprocess.run(
         ["make", f"-j{nproc}"] + common_flags,
         cwd=src_dir,
-        capture_output=True,
-        text=True,
+        stdout=subprocess.DEVNULL,  # only stderr is reported on failure
+        stderr=subprocess.PIPE,
     )
     if result.returncode != 0:
-        print(f"Build failed:\n{result.stderr[-2000:]}", file=sys.stderr)
+        _write_stderr_tail("Build failed", result.stderr)
         sys.exit(1)
     print("  Build succeeded")
 
@@ -155,11 +165,11 @@ def build_openblas_from_source(src_dir: Path, install_prefix: Path) -> None:
     result = subprocess.run(
         ["make", f"PREFIX={install_prefix}"] + common_flags + ["install"],
         cwd=src_dir,
-        capture_output=True,
-        text=True,
+        stdout=subprocess.DEVNULL,  # only stderr is reported on failure
+        stderr=subprocess.PIPE,
     )
     if result.returncode != 0:
-        print(f"Install failed:\n{result.stderr[-2000:]}", file=sys.stderr)
+        _write_stderr_tail("Install failed", result.stderr)
         sys.exit(1)
     print("  Install succeeded")
 